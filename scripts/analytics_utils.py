@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Public Radio Agents Framework Analytics Utilities
+Vectorized column parsing shared by the donor and performance analysis scripts
+"""
+
+from datetime import datetime
+from typing import List
+
+import numpy as np
+
+
+def parse_dates(values: List[str], date_format: str = None) -> "np.ndarray":
+    """Parse a column of dates to datetime64[D], with NaT for unreadable values
+
+    ISO dates (and ISO timestamps, which are truncated to the day) convert in a
+    single NumPy call. strptime is only used for an explicit date_format, or for
+    the individual values of a chunk that NumPy could not parse.
+    """
+    column = np.char.strip(np.array(values, dtype=str))
+    if date_format:
+        return np.array([_strptime_day(value, date_format) for value in column.tolist()], dtype='datetime64[D]')
+
+    days = column.astype('U10')
+    try:
+        return days.astype('datetime64[D]')
+    except ValueError:
+        return np.array([_strptime_day(value[:10], '%Y-%m-%d') for value in days.tolist()], dtype='datetime64[D]')
+
+
+def _strptime_day(value: str, date_format: str) -> str:
+    try:
+        return datetime.strptime(value, date_format).strftime('%Y-%m-%d')
+    except ValueError:
+        return 'NaT'
+
+
+def parse_numbers(values: List[str], strip_chars: str = '$,') -> "np.ndarray":
+    """Parse a column of numbers to float64, with NaN for unreadable values"""
+    column = np.char.strip(np.array(values, dtype=str))
+    for char in strip_chars:
+        column = np.char.replace(column, char, '')
+    column = np.where(column == '', 'nan', column)
+
+    try:
+        return column.astype(np.float64)
+    except ValueError:
+        return np.array([_to_float(value) for value in column.tolist()], dtype=np.float64)
+
+
+def _to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return float('nan')
+
+
+def parse_hours(values: List[str]) -> "np.ndarray":
+    """Parse a column of hours of the day to float64, with NaN for unreadable values
+
+    Numeric values convert in a single NumPy call. Whether they are hours ('6',
+    '6.0') or HHMM times ('600', '0600', '1430') is decided once for the whole
+    column: it is HHMM when some value is above 23 and every value is a valid
+    HHMM time. 'HH:MM[:SS]', 'h:MM AM' and ISO timestamps are parsed per value.
+    """
+    column = np.char.strip(np.array(values, dtype=str))
+    numbers = np.where(column == '', 'nan', column)
+    try:
+        numbers = numbers.astype(np.float64)
+    except ValueError:
+        numbers = np.array([_to_float(value) for value in numbers.tolist()], dtype=np.float64)
+
+    numeric = numbers[~np.isnan(numbers)]
+    if len(numeric) and numeric.max() > 23 and np.all(
+            (numeric >= 0) & (numeric < 2400) & (numeric % 1 == 0) & (numeric % 100 < 60)):
+        numbers = numbers // 100
+
+    hours = np.floor(numbers)
+    text = np.isnan(numbers) & (column != '')
+    if text.any():
+        hours[text] = [_hour_of(value) for value in column[text].tolist()]
+    return np.where((hours >= 0) & (hours < 24), hours, np.nan)
+
+
+def _hour_of(value: str) -> float:
+    value = value.upper()
+    if len(value) > 10 and value[4:5] == '-':
+        value = value[11:]
+
+    suffix = value[-2:] if value.endswith(('AM', 'PM')) else ''
+    value = value[:len(value) - len(suffix)].strip()
+    try:
+        hour = int(float(value.split(':')[0]))
+    except (ValueError, OverflowError):
+        return float('nan')
+
+    if suffix:
+        hour = hour % 12 + (12 if suffix == 'PM' else 0)
+    return float(hour)
@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+Public Radio Agents Framework Donor Data Analyzer
+Streams donor transaction exports and produces the compact summary used by the analyze-donor-data task
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+else:
+    # analytics_utils needs NumPy; its own import errors are not a missing NumPy
+    from analytics_utils import parse_dates, parse_numbers
+
+# Giving level segments from tasks/analyze-donor-data.md
+MAJOR_DONOR_SHARE = 0.10
+MID_LEVEL_SHARE = 0.20
+NEW_DONOR_DAYS = 365
+
+# Without --period-end, a final year whose last gift falls this close to
+# December 31 is treated as complete
+YEAR_END_GRACE_DAYS = 7
+
+# RFM segment rules, checked in order: (name, min recency, min frequency, min monetary)
+RFM_SEGMENTS = [
+    ("Champions", 4, 4, 4),
+    ("Loyal", 3, 4, 1),
+    ("Big Spenders", 1, 1, 5),
+    ("Promising", 4, 1, 1),
+    ("Needs Attention", 3, 1, 1),
+    ("At Risk", 1, 3, 1),
+]
+
+
+class DonorDataAnalyzer:
+    def __init__(self, csv_path: str, donor_column: str = "donor_id", date_column: str = "gift_date",
+                 amount_column: str = "amount", date_format: str = None, chunk_size: int = 50000,
+                 lapsed_months: int = 18, period_end: str = None):
+        self.csv_path = Path(csv_path)
+        self.donor_column = donor_column
+        self.date_column = date_column
+        self.amount_column = amount_column
+        self.date_format = date_format
+        self.chunk_size = chunk_size
+        self.lapsed_days = int(lapsed_months * 365 / 12)
+        self.lapsed_months = lapsed_months
+        self.period_end = period_end
+
+        self.donor_index: Dict[str, int] = {}
+        self.donor_ids: List[str] = []
+        self.rows_processed = 0
+        self.rows_skipped = 0
+
+        # Per-donor aggregates, grown as new donors appear
+        self._capacity = 0
+        self.first_day = None
+        self.last_day = None
+        self.gift_count = None
+        self.total_amount = None
+        self.yearly_amount: Dict[int, "np.ndarray"] = {}
+        self.lapsed_ranked = None
+
+    def analyze(self) -> Dict:
+        """Stream the export in chunks, then summarize the per-donor aggregates"""
+        self._grow(1024)
+
+        with open(self.csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            names = [self.donor_column, self.date_column, self.amount_column]
+            missing = set(names) - set(header)
+            if missing:
+                raise ValueError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+
+            positions = [header.index(name) for name in names]
+            chunk = [[], [], []]
+            for row in reader:
+                for column, position in zip(chunk, positions):
+                    column.append(row[position] if position < len(row) else '')
+                if len(chunk[0]) >= self.chunk_size:
+                    self._process_chunk(*chunk)
+                    chunk = [[], [], []]
+            if chunk[0]:
+                self._process_chunk(*chunk)
+
+        return self._summarize()
+
+    def _grow(self, required: int):
+        """Grow the per-donor arrays to hold at least the required number of donors"""
+        if required <= self._capacity:
+            return
+
+        capacity = max(required, self._capacity * 2)
+        extra = capacity - self._capacity
+
+        def extend(array, fill, dtype):
+            padding = np.full(extra, fill, dtype=dtype)
+            return padding if array is None else np.concatenate([array, padding])
+
+        self.first_day = extend(self.first_day, np.iinfo(np.int64).max, np.int64)
+        self.last_day = extend(self.last_day, np.iinfo(np.int64).min, np.int64)
+        self.gift_count = extend(self.gift_count, 0, np.int64)
+        self.total_amount = extend(self.total_amount, 0.0, np.float64)
+        for year in self.yearly_amount:
+            self.yearly_amount[year] = extend(self.yearly_amount[year], 0.0, np.float64)
+
+        self._capacity = capacity
+
+    def _process_chunk(self, donor_values: List[str], date_values: List[str], amount_values: List[str]):
+        """Parse one chunk of columns and fold it into the per-donor aggregates"""
+        donor_ids = np.char.strip(np.array(donor_values, dtype=str))
+        day_values = parse_dates(date_values, self.date_format)
+        gift_amounts = parse_numbers(amount_values)
+
+        valid = (donor_ids != '') & ~np.isnat(day_values) & ~np.isnan(gift_amounts)
+        self.rows_processed += len(donor_ids)
+        self.rows_skipped += int((~valid).sum())
+        if not valid.any():
+            return
+
+        idx = self._encode_donors(donor_ids[valid])
+        day_values = day_values[valid]
+        gift_amounts = gift_amounts[valid]
+
+        self._grow(len(self.donor_ids))
+        n = self._capacity
+
+        days = day_values.astype(np.int64)
+        years = day_values.astype('datetime64[Y]').astype(np.int64) + 1970
+
+        np.minimum.at(self.first_day, idx, days)
+        np.maximum.at(self.last_day, idx, days)
+        self.gift_count += np.bincount(idx, minlength=n)
+        self.total_amount += np.bincount(idx, weights=gift_amounts, minlength=n)
+
+        for year in np.unique(years):
+            mask = years == year
+            if int(year) not in self.yearly_amount:
+                self.yearly_amount[int(year)] = np.zeros(n, dtype=np.float64)
+            self.yearly_amount[int(year)] += np.bincount(idx[mask], weights=gift_amounts[mask], minlength=n)
+
+    def _encode_donors(self, donor_ids) -> "np.ndarray":
+        """Map donor IDs to row indexes, registering donors not seen in earlier chunks"""
+        uniques, first_seen, inverse = np.unique(donor_ids, return_index=True, return_inverse=True)
+        codes = np.empty(len(uniques), dtype=np.int64)
+        # Register new donors in file order so ranking ties break the same way for any chunk size
+        for i in np.argsort(first_seen).tolist():
+            donor = str(uniques[i])
+            index = self.donor_index.get(donor)
+            if index is None:
+                index = len(self.donor_ids)
+                self.donor_index[donor] = index
+                self.donor_ids.append(donor)
+            codes[i] = index
+        return codes[inverse.reshape(-1)]
+
+    def _summarize(self) -> Dict:
+        """Compute segments, RFM scores, retention, upgrades and lapsed donors"""
+        donor_total = len(self.donor_ids)
+        if donor_total == 0:
+            raise ValueError("No valid gift rows found")
+
+        first_day = self.first_day[:donor_total]
+        last_day = self.last_day[:donor_total]
+        gift_count = self.gift_count[:donor_total]
+        total_amount = self.total_amount[:donor_total]
+        as_of = int(last_day.max())
+        if self.period_end:
+            period_end = parse_dates([self.period_end])[0]
+            if np.isnat(period_end):
+                raise ValueError(f"Invalid period end date: {self.period_end} (expected YYYY-MM-DD)")
+            if int(period_end.astype(np.int64)) < as_of:
+                raise ValueError(f"Period end {self.period_end} is before the last gift ({self._day_to_str(as_of)})")
+            as_of = int(period_end.astype(np.int64))
+        recency = as_of - last_day
+        years = self._complete_years(as_of)
+        partial_year = max(self.yearly_amount) if max(self.yearly_amount) not in years else None
+
+        return {
+            'source': self.csv_path.name,
+            'rows_processed': self.rows_processed,
+            'rows_skipped': self.rows_skipped,
+            'donors': donor_total,
+            'first_gift': self._day_to_str(first_day.min()),
+            'as_of': self._day_to_str(as_of),
+            'period_end': self.period_end,
+            'total_giving': round(float(total_amount.sum()), 2),
+            'gifts': int(gift_count.sum()),
+            'partial_year': partial_year,
+            'giving_levels': self._giving_levels(total_amount, gift_count, first_day, recency, as_of),
+            'rfm_segments': self._rfm_segments(recency, gift_count, total_amount),
+            'retention': self._retention(years, donor_total),
+            'cohorts': self._cohorts(years, donor_total),
+            'upgrades': self._upgrades(years, donor_total),
+            'lapsed': self._lapsed(recency, total_amount, last_day),
+        }
+
+    def _giving_levels(self, total_amount, gift_count, first_day, recency, as_of) -> List[Dict]:
+        """Major, mid-level, new, lapsed and regular donors as defined in the analysis task"""
+        donor_total = len(total_amount)
+        order = np.argsort(-total_amount, kind='stable')
+        rank = np.empty(donor_total, dtype=np.int64)
+        rank[order] = np.arange(donor_total)
+
+        major = rank < max(1, int(round(donor_total * MAJOR_DONOR_SHARE)))
+        mid_level = ~major & (rank < int(round(donor_total * (MAJOR_DONOR_SHARE + MID_LEVEL_SHARE))))
+        lapsed = recency >= self.lapsed_days
+        new = (as_of - first_day) < NEW_DONOR_DAYS
+
+        # A donor lands in the first matching level
+        levels = [
+            ("Lapsed", lapsed),
+            ("Major", major & ~lapsed),
+            ("Mid-level", mid_level & ~lapsed),
+            ("New", new & ~major & ~mid_level & ~lapsed),
+        ]
+        assigned = np.zeros(donor_total, dtype=bool)
+        for _, mask in levels:
+            assigned |= mask
+        levels.append(("Regular", ~assigned))
+
+        return [self._segment_row(name, mask, total_amount, gift_count) for name, mask in levels]
+
+    def _rfm_segments(self, recency, gift_count, total_amount) -> List[Dict]:
+        """Quintile RFM scores (5 is best) rolled up into named segments"""
+        r_score = self._quintile(-recency)
+        f_score = self._quintile(gift_count)
+        m_score = self._quintile(total_amount)
+
+        assigned = np.zeros(len(recency), dtype=bool)
+        segments = []
+        for name, min_r, min_f, min_m in RFM_SEGMENTS:
+            mask = ~assigned & (r_score >= min_r) & (f_score >= min_f) & (m_score >= min_m)
+            assigned |= mask
+            segments.append(self._segment_row(name, mask, total_amount, gift_count))
+        segments.append(self._segment_row("Hibernating", ~assigned, total_amount, gift_count))
+
+        return segments
+
+    def _quintile(self, values) -> "np.ndarray":
+        """Score values 1-5 by rank, with ties sharing the lower score"""
+        order = np.argsort(values, kind='stable')
+        sorted_values = values[order]
+        # Ties take the rank of their first occurrence
+        first_rank = np.searchsorted(sorted_values, sorted_values, side='left')
+        scores = np.empty(len(values), dtype=np.int64)
+        scores[order] = 1 + (first_rank * 5) // len(values)
+        return scores
+
+    def _segment_row(self, name: str, mask, total_amount, gift_count) -> Dict:
+        """Summary statistics for one donor segment"""
+        donors = int(mask.sum())
+        giving = float(total_amount[mask].sum())
+        gifts = int(gift_count[mask].sum())
+        return {
+            'segment': name,
+            'donors': donors,
+            'share_of_donors': round(donors / len(mask), 4),
+            'total_giving': round(giving, 2),
+            'average_gift': round(giving / gifts, 2) if gifts else 0.0,
+        }
+
+    def _complete_years(self, as_of: int) -> List[int]:
+        """Calendar years in the data, dropping a final year the export ends partway through
+
+        Comparing a partial year against full ones would show falling retention
+        and mostly downgrades purely because fewer months were included. With an
+        explicit period end the final year must run to December 31; otherwise the
+        last gift date only has to fall within YEAR_END_GRACE_DAYS of it.
+        """
+        years = sorted(self.yearly_amount)
+        year_end = np.datetime64(f"{years[-1]}-12-31", 'D').astype(np.int64)
+        grace = 0 if self.period_end else YEAR_END_GRACE_DAYS
+        return years[:-1] if as_of < year_end - grace else years
+
+    def _retention(self, years: List[int], donor_total: int) -> List[Dict]:
+        """Year-over-year overall and first-year retention over complete years"""
+        first_year = self._first_year(donor_total)
+        rows = []
+
+        for previous, current in zip(years, years[1:]):
+            if current != previous + 1:
+                continue
+            gave_previous = self.yearly_amount[previous][:donor_total] > 0
+            gave_current = self.yearly_amount[current][:donor_total] > 0
+            new_previous = gave_previous & (first_year == previous)
+
+            rows.append({
+                'year': current,
+                'prior_year_donors': int(gave_previous.sum()),
+                'retained': int((gave_previous & gave_current).sum()),
+                'retention_rate': self._rate(gave_previous & gave_current, gave_previous),
+                'first_year_retention_rate': self._rate(new_previous & gave_current, new_previous),
+                'reactivated': int((gave_current & ~gave_previous & (first_year < previous)).sum()),
+            })
+
+        return rows
+
+    def _cohorts(self, years: List[int], donor_total: int) -> List[Dict]:
+        """Share of each first-gift-year cohort still giving in each following complete year"""
+        first_year = self._first_year(donor_total)
+        rows = []
+
+        for cohort in years:
+            members = first_year == cohort
+            size = int(members.sum())
+            if size == 0:
+                continue
+            retained = [self._rate(members & (self.yearly_amount[year][:donor_total] > 0), members)
+                        for year in years if year > cohort]
+            rows.append({'cohort': cohort, 'donors': size, 'retention_by_year': retained})
+
+        return rows
+
+    def _upgrades(self, years: List[int], donor_total: int) -> Dict:
+        """Compare giving in the last two complete calendar years for donors who gave in both"""
+        if len(years) < 2 or years[-1] != years[-2] + 1:
+            return {}
+
+        previous = self.yearly_amount[years[-2]][:donor_total]
+        current = self.yearly_amount[years[-1]][:donor_total]
+        both = (previous > 0) & (current > 0)
+        upgraded = both & (current > previous)
+        downgraded = both & (current < previous)
+
+        return {
+            'compared_years': [years[-2], years[-1]],
+            'donors_in_both_years': int(both.sum()),
+            'upgraded': int(upgraded.sum()),
+            'downgraded': int(downgraded.sum()),
+            'unchanged': int((both & ~upgraded & ~downgraded).sum()),
+            'upgrade_revenue': round(float((current - previous)[upgraded].sum()), 2),
+            'downgrade_revenue': round(float((previous - current)[downgraded].sum()), 2),
+        }
+
+    def _lapsed(self, recency, total_amount, last_day, top: int = 10) -> Dict:
+        """Lapsed donors ranked by lifetime giving"""
+        lapsed = np.flatnonzero(recency >= self.lapsed_days)
+        ranked = lapsed[np.argsort(-total_amount[lapsed], kind='stable')]
+        self.lapsed_ranked = ranked
+
+        return {
+            'threshold_months': self.lapsed_months,
+            'donors': int(len(lapsed)),
+            'lifetime_giving': round(float(total_amount[lapsed].sum()), 2),
+            'top_donors': [self._lapsed_row(i, total_amount, last_day) for i in ranked[:top]],
+        }
+
+    def _lapsed_row(self, index: int, total_amount, last_day) -> Dict:
+        return {
+            'donor_id': self.donor_ids[index],
+            'lifetime_giving': round(float(total_amount[index]), 2),
+            'gifts': int(self.gift_count[index]),
+            'last_gift': self._day_to_str(last_day[index]),
+        }
+
+    def write_lapsed_csv(self, output_path: str):
+        """Write the full lapsed-donor list, ranked by lifetime giving"""
+        last_day = self.last_day[:len(self.donor_ids)]
+        total_amount = self.total_amount[:len(self.donor_ids)]
+
+        with open(output_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['donor_id', 'lifetime_giving', 'gifts', 'last_gift'])
+            writer.writeheader()
+            for index in self.lapsed_ranked:
+                writer.writerow(self._lapsed_row(index, total_amount, last_day))
+
+    def _first_year(self, donor_total: int) -> "np.ndarray":
+        """Calendar year of each donor's first gift"""
+        days = self.first_day[:donor_total].astype('datetime64[D]')
+        return days.astype('datetime64[Y]').astype(np.int64) + 1970
+
+    def _rate(self, numerator, denominator) -> float:
+        total = int(denominator.sum())
+        return round(int(numerator.sum()) / total, 4) if total else 0.0
+
+    def _day_to_str(self, day) -> str:
+        return str(np.datetime64(int(day), 'D'))
+
+
+def format_markdown(summary: Dict) -> str:
+    """Render the summary as compact markdown to paste into an agent session"""
+    lines = [
+        "# Donor Data Summary",
+        f"Source: {summary['source']} | Rows: {summary['rows_processed']:,} ({summary['rows_skipped']:,} skipped) | "
+        f"Donors: {summary['donors']:,} | Gifts: {summary['gifts']:,} | Total: ${summary['total_giving']:,.2f}",
+        f"Period: {summary['first_gift']} to {summary['as_of']} "
+        f"(analysis as of {'period end' if summary['period_end'] else 'last gift date'})",
+    ]
+    if summary['partial_year']:
+        lines.append(f"Note: {summary['partial_year']} is a partial year (data through {summary['as_of']}) and is "
+                     f"excluded from the retention, cohort and upgrade tables.")
+
+    for title, key in (("Giving Levels", 'giving_levels'), ("RFM Segments", 'rfm_segments')):
+        lines.append(f"\n## {title}")
+        lines.append("| Segment | Donors | Share | Total Giving | Avg Gift |")
+        lines.append("|---|---|---|---|---|")
+        for row in summary[key]:
+            lines.append(f"| {row['segment']} | {row['donors']:,} | {row['share_of_donors']:.1%} | "
+                         f"${row['total_giving']:,.2f} | ${row['average_gift']:,.2f} |")
+
+    if summary['retention']:
+        lines.append("\n## Retention")
+        lines.append("| Year | Prior-Year Donors | Retained | Retention | First-Year Retention | Reactivated |")
+        lines.append("|---|---|---|---|---|---|")
+        for row in summary['retention']:
+            lines.append(f"| {row['year']} | {row['prior_year_donors']:,} | {row['retained']:,} | "
+                         f"{row['retention_rate']:.1%} | {row['first_year_retention_rate']:.1%} | {row['reactivated']:,} |")
+
+    if summary['cohorts']:
+        lines.append("\n## Cohorts (share of first-gift-year cohort giving in year +1, +2, ...)")
+        for row in summary['cohorts']:
+            rates = ', '.join(f"{rate:.0%}" for rate in row['retention_by_year']) or '-'
+            lines.append(f"- {row['cohort']} ({row['donors']:,} donors): {rates}")
+
+    upgrades = summary['upgrades']
+    if upgrades:
+        previous, current = upgrades['compared_years']
+        lines.append(f"\n## Upgrades ({previous} to {current})")
+        lines.append(f"- Donors in both years: {upgrades['donors_in_both_years']:,}")
+        lines.append(f"- Upgraded: {upgrades['upgraded']:,} (+${upgrades['upgrade_revenue']:,.2f})")
+        lines.append(f"- Downgraded: {upgrades['downgraded']:,} (-${upgrades['downgrade_revenue']:,.2f})")
+        lines.append(f"- Unchanged: {upgrades['unchanged']:,}")
+
+    lapsed = summary['lapsed']
+    lines.append(f"\n## Lapsed Donors ({lapsed['threshold_months']}+ months since last gift)")
+    lines.append(f"- {lapsed['donors']:,} donors, ${lapsed['lifetime_giving']:,.2f} lifetime giving")
+    for row in lapsed['top_donors']:
+        lines.append(f"- {row['donor_id']}: ${row['lifetime_giving']:,.2f} over {row['gifts']} gifts, last {row['last_gift']}")
+
+    return '\n'.join(lines)
+
+
+def main():
+    """Main donor data analysis function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Analyze a donor transaction CSV export for the analyze-donor-data task')
+    parser.add_argument('csv_file', help='Donor transaction CSV (one row per gift)')
+    parser.add_argument('--donor-column', default='donor_id', help='Donor ID column (default: donor_id)')
+    parser.add_argument('--date-column', default='gift_date', help='Gift date column (default: gift_date)')
+    parser.add_argument('--amount-column', default='amount', help='Gift amount column (default: amount)')
+    parser.add_argument('--date-format',
+                       help='strptime format for gift dates, e.g. %%m/%%d/%%Y (default: ISO YYYY-MM-DD)')
+    parser.add_argument('--period-end',
+                       help='Last day the export covers, YYYY-MM-DD (default: last gift date, with a final year '
+                            'counted as complete if its last gift is within a week of December 31)')
+    parser.add_argument('--lapsed-months', type=int, default=18,
+                       help='Months without a gift before a donor counts as lapsed (default: 18)')
+    parser.add_argument('--chunk-size', type=int, default=50000,
+                       help='Rows read per chunk (default: 50000)')
+    parser.add_argument('--format', choices=['markdown', 'json'], default='markdown',
+                       help='Summary format (default: markdown)')
+    parser.add_argument('--output', '-o', help='Write the summary to a file instead of stdout')
+    parser.add_argument('--lapsed-output', help='Write the full lapsed-donor list to this CSV file')
+
+    args = parser.parse_args()
+
+    if np is None:
+        print("❌ NumPy is required: pip install numpy")
+        return 1
+
+    analyzer = DonorDataAnalyzer(args.csv_file, donor_column=args.donor_column, date_column=args.date_column,
+                                 amount_column=args.amount_column, date_format=args.date_format,
+                                 chunk_size=args.chunk_size, lapsed_months=args.lapsed_months,
+                                 period_end=args.period_end)
+
+    try:
+        summary = analyzer.analyze()
+    except (OSError, ValueError) as e:
+        print(f"❌ Error analyzing donor data: {e}")
+        return 1
+
+    if args.lapsed_output:
+        analyzer.write_lapsed_csv(args.lapsed_output)
+
+    if args.format == 'json':
+        report = json.dumps(summary, indent=2)
+    else:
+        report = format_markdown(summary)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+        print(f"✅ Summary written: {args.output}")
+    else:
+        print(report)
+
+    if args.lapsed_output:
+        print(f"✅ Lapsed donor list written: {args.lapsed_output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
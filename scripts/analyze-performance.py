@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Public Radio Agents Framework Performance Analyzer
+Aggregates spot-delivery and hourly listening logs for the sponsorship and programming performance tasks
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+else:
+    # analytics_utils needs NumPy; its own import errors are not a missing NumPy
+    from analytics_utils import parse_dates, parse_hours, parse_numbers
+
+# Statuses that count as a delivered spot; anything else counts as missed
+AIRED_STATUSES = {'', 'aired', 'ran', 'played', 'delivered', 'ok', 'makegood', 'make-good'}
+
+# Weekday dayparts by starting hour; Saturday and Sunday are reported as Weekend
+DAYPARTS = [
+    (0, "Overnight (12a-6a)"),
+    (6, "Morning Drive (6a-10a)"),
+    (10, "Midday (10a-3p)"),
+    (15, "Afternoon Drive (3p-7p)"),
+    (19, "Evening (7p-12a)"),
+]
+WEEKEND = "Weekend"
+
+# Per-log layout: categorical key columns and summed value columns. Every
+# table is also keyed by 'source', the log file each row was ingested from.
+LOG_KINDS = {
+    'spots': {'categories': ['sponsor', 'program'], 'values': ['scheduled', 'aired']},
+    'listening': {'categories': ['program'], 'values': ['listener_hours', 'hours']},
+}
+
+
+class PerformanceAnalyzer:
+    def __init__(self, cache_dir: str = ".analytics-cache", columns: Dict[str, str] = None,
+                 date_format: str = None, chunk_size: int = 100000):
+        self.cache_dir = Path(cache_dir)
+        self.columns = {
+            'date': 'date',
+            'hour': 'hour',
+            'sponsor': 'sponsor',
+            'program': 'program',
+            'status': 'status',
+            'listeners': 'listeners',
+        }
+        self.columns.update(columns or {})
+        self.date_format = date_format
+        self.chunk_size = chunk_size
+
+        self.manifest: Dict[str, Dict] = {}
+        self.tables: Dict[str, Dict] = {kind: self._empty_table(kind) for kind in LOG_KINDS}
+        self.rows_skipped = 0
+
+    def _empty_table(self, kind: str) -> Dict:
+        """Base table of (source, day, hour, categories) keys with summed values"""
+        layout = LOG_KINDS[kind]
+        table = {
+            'day': np.zeros(0, dtype=np.int64),
+            'hour': np.zeros(0, dtype=np.int64),
+            'categories': {name: [] for name in ['source'] + layout['categories']},
+        }
+        for name in ['source'] + layout['categories']:
+            table[name] = np.zeros(0, dtype=np.int64)
+        for name in layout['values']:
+            table[name] = np.zeros(0, dtype=np.float64)
+        return table
+
+    def load_cache(self):
+        """Load previously ingested aggregates and the file manifest"""
+        manifest_file = self.cache_dir / "manifest.json"
+        if manifest_file.exists():
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+
+        for kind in LOG_KINDS:
+            cache_file = self.cache_dir / f"{kind}.npz"
+            if not cache_file.exists():
+                continue
+
+            with np.load(cache_file) as data:
+                if 'source' not in data.files:
+                    # Caches from before per-file tracking are rebuilt from the logs
+                    self.manifest = {path: sig for path, sig in self.manifest.items() if sig.get('kind') != kind}
+                    continue
+                table = self._empty_table(kind)
+                for key in data.files:
+                    if key.startswith('categories_'):
+                        table['categories'][key[len('categories_'):]] = data[key].tolist()
+                    else:
+                        table[key] = data[key]
+                self.tables[kind] = table
+
+    def save_cache(self):
+        """Write aggregates and the file manifest to the cache directory"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        for kind, table in self.tables.items():
+            arrays = {key: value for key, value in table.items() if key != 'categories'}
+            for name, values in table['categories'].items():
+                arrays[f'categories_{name}'] = np.array(values, dtype=str)
+            np.savez_compressed(self.cache_dir / f"{kind}.npz", **arrays)
+
+        with open(self.cache_dir / "manifest.json", 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+
+    def ingest(self, kind: str, path: str) -> bool:
+        """Aggregate one log file unless it is already cached unchanged
+
+        Rows are cached per source file: a changed file replaces everything it
+        contributed before, while other files covering the same days are kept.
+        """
+        file_path = Path(path).resolve()
+        stat = file_path.stat()
+        signature = {'kind': kind, 'size': stat.st_size, 'mtime': stat.st_mtime}
+        if self.manifest.get(str(file_path)) == signature:
+            return False
+
+        current = self.tables[kind]
+        source = int(self._encode(current['categories']['source'], np.array([str(file_path)]))[0])
+        table = self._empty_table(kind)
+        table['categories'] = current['categories']
+        skipped = self.rows_skipped
+        for chunk in self._read_chunks(kind, file_path, source):
+            table = self._group(kind, self._concat(kind, table, chunk))
+
+        skipped = self.rows_skipped - skipped
+        if skipped and len(table['day']) == 0:
+            raise ValueError(f"All {skipped:,} rows of {file_path.name} were skipped - "
+                             f"check the --*-column and --date-format options")
+
+        keep = current['source'] != source
+        current = {key: (value[keep] if key != 'categories' else value) for key, value in current.items()}
+        self.tables[kind] = self._group(kind, self._concat(kind, current, table))
+
+        self.manifest[str(file_path)] = signature
+        return True
+
+    def _read_chunks(self, kind: str, file_path: Path, source: int) -> Iterator[Dict]:
+        """Yield parsed, per-chunk pre-aggregated rows from a CSV or Parquet log"""
+        wanted = ['date', 'hour'] + LOG_KINDS[kind]['categories']
+        wanted += ['status'] if kind == 'spots' else ['listeners']
+
+        for columns in self._read_columns(file_path, [self.columns[name] for name in wanted]):
+            raw = {name: columns.get(self.columns[name]) for name in wanted}
+            yield self._group(kind, self._parse_chunk(kind, raw, source))
+
+    def _read_columns(self, file_path: Path, names: List[str]) -> Iterator[Dict[str, list]]:
+        """Yield column lists of at most chunk_size rows"""
+        if file_path.suffix == '.parquet':
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ValueError("Reading Parquet logs requires pyarrow: pip install pyarrow")
+
+            parquet_file = pq.ParquetFile(file_path)
+            present = [name for name in names if name in parquet_file.schema_arrow.names]
+            for batch in parquet_file.iter_batches(batch_size=self.chunk_size, columns=present):
+                yield {name: [None if v is None else str(v) for v in values]
+                       for name, values in batch.to_pydict().items()}
+            return
+
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            positions = {name: header.index(name) for name in names if name in header}
+
+            chunk = {name: [] for name in positions}
+            rows = 0
+            for row in reader:
+                for name, position in positions.items():
+                    chunk[name].append(row[position] if position < len(row) else '')
+                rows += 1
+                if rows >= self.chunk_size:
+                    yield chunk
+                    chunk = {name: [] for name in positions}
+                    rows = 0
+            if rows:
+                yield chunk
+
+    def _parse_chunk(self, kind: str, raw: Dict[str, list], source: int) -> Dict:
+        """Convert raw column lists into a table of codes and values"""
+        layout = LOG_KINDS[kind]
+        required = ['date', 'hour'] + layout['categories'] + ([] if kind == 'spots' else ['listeners'])
+        missing = [self.columns[name] for name in required if raw.get(name) is None]
+        if missing:
+            raise ValueError(f"{kind} log is missing column(s): {', '.join(missing)}")
+
+        days = parse_dates(raw['date'], self.date_format)
+        hours = parse_hours(raw['hour'])
+        valid = ~np.isnat(days) & ~np.isnan(hours)
+
+        if kind == 'spots':
+            statuses = np.char.lower(np.char.strip(np.array(raw['status'] or [''] * len(days), dtype=str)))
+            values = {
+                'scheduled': np.ones(len(days), dtype=np.float64),
+                'aired': np.isin(statuses, list(AIRED_STATUSES)).astype(np.float64),
+            }
+        else:
+            listeners = parse_numbers(raw['listeners'], strip_chars=',')
+            valid &= ~np.isnan(listeners)
+            values = {'listener_hours': listeners, 'hours': np.ones(len(days), dtype=np.float64)}
+
+        self.rows_skipped += int((~valid).sum())
+
+        table = {
+            'source': np.full(int(valid.sum()), source, dtype=np.int64),
+            'day': days[valid].astype(np.int64),
+            'hour': hours[valid].astype(np.int64),
+            'categories': self.tables[kind]['categories'],
+        }
+        for name in layout['categories']:
+            table[name] = self._encode(table['categories'][name], np.array(raw[name], dtype=str)[valid])
+        for name, column in values.items():
+            table[name] = column[valid]
+        return table
+
+    def _encode(self, categories: List[str], values) -> "np.ndarray":
+        """Map strings to stable integer codes, appending unseen values to the category list"""
+        values = np.char.strip(values)
+        uniques, inverse = np.unique(np.where(values == '', '(unspecified)', values), return_inverse=True)
+        lookup = {name: code for code, name in enumerate(categories)}
+        codes = np.empty(len(uniques), dtype=np.int64)
+        for i, name in enumerate(uniques.tolist()):
+            if name not in lookup:
+                lookup[name] = len(categories)
+                categories.append(name)
+            codes[i] = lookup[name]
+        return codes[inverse]
+
+    def _concat(self, kind: str, first: Dict, second: Dict) -> Dict:
+        """Stack two tables that share category lists"""
+        combined = {key: np.concatenate([first[key], second[key]]) for key in first if key != 'categories'}
+        combined['categories'] = first['categories']
+        return combined
+
+    def _group(self, kind: str, table: Dict) -> Dict:
+        """Collapse rows with identical keys, summing their values"""
+        layout = LOG_KINDS[kind]
+        key_names = ['source', 'day', 'hour'] + layout['categories']
+        if len(table['day']) == 0:
+            return table
+
+        # Pack the key columns into one integer so grouping is a single 1-D sort
+        offsets = [int(table[name].min()) for name in key_names]
+        radixes = [int(table[name].max()) - offset + 1 for name, offset in zip(key_names, offsets)]
+        if np.prod(radixes, dtype=np.float64) >= 2 ** 62:
+            raise ValueError("Too many distinct log keys to group - split the logs into smaller date ranges")
+        packed = np.zeros(len(table['day']), dtype=np.int64)
+        for name, offset, radix in zip(key_names, offsets, radixes):
+            packed = packed * radix + (table[name] - offset)
+        unique_packed, inverse = np.unique(packed, return_inverse=True)
+        group_count = len(unique_packed)
+
+        grouped = {}
+        for name, offset, radix in reversed(list(zip(key_names, offsets, radixes))):
+            grouped[name] = unique_packed % radix + offset
+            unique_packed = unique_packed // radix
+        for name in layout['values']:
+            grouped[name] = np.bincount(inverse, weights=table[name], minlength=group_count)
+        grouped['categories'] = table['categories']
+        return grouped
+
+    def report(self, dimensions: List[str], top: int = 15) -> Dict:
+        """Build compact tables for each requested dimension"""
+        summary = {'coverage': self._coverage(), 'spots': {}, 'listening': {}}
+        spots = self.tables['spots']
+        listening = self.tables['listening']
+
+        if len(spots['day']):
+            impressions = self._impressions()
+            for dimension in dimensions:
+                labels = self._labels('spots', dimension)
+                if labels is None:
+                    continue
+                summary['spots'][dimension] = self._spot_rows(dimension, labels, impressions, top)
+
+        if len(listening['day']):
+            for dimension in dimensions:
+                labels = self._labels('listening', dimension)
+                if labels is None:
+                    continue
+                summary['listening'][dimension] = self._listening_rows(dimension, labels, top)
+
+        return summary
+
+    def _coverage(self) -> Dict:
+        coverage = {}
+        for kind, table in self.tables.items():
+            if len(table['day']):
+                coverage[kind] = {
+                    'days': int(len(np.unique(table['day']))),
+                    'first_day': str(np.datetime64(int(table['day'].min()), 'D')),
+                    'last_day': str(np.datetime64(int(table['day'].max()), 'D')),
+                }
+        return coverage
+
+    def _labels(self, kind: str, dimension: str):
+        """Group label for every base row along one dimension, or None if not applicable"""
+        table = self.tables[kind]
+        if dimension in table['categories']:
+            return np.array(table['categories'][dimension], dtype=object)[table[dimension]]
+        if dimension == 'daypart':
+            return self._dayparts(table['day'], table['hour'])
+        if dimension == 'week':
+            # 1970-01-01 was a Thursday; shift so weeks start on Monday
+            monday = table['day'] - (table['day'] + 3) % 7
+            return monday.astype('datetime64[D]').astype(str).astype(object)
+        return None
+
+    def _dayparts(self, days, hours) -> "np.ndarray":
+        starts = np.array([start for start, _ in DAYPARTS])
+        names = np.array([name for _, name in DAYPARTS] + [WEEKEND], dtype=object)
+        index = np.searchsorted(starts, hours, side='right') - 1
+        weekend = (days + 3) % 7 >= 5
+        return names[np.where(weekend, len(DAYPARTS), index)]
+
+    def _impressions(self) -> "np.ndarray":
+        """Estimated listener impressions per spot row from same-hour listening data"""
+        spots = self.tables['spots']
+        listening = self.tables['listening']
+        if len(listening['day']) == 0:
+            return np.zeros(len(spots['day']))
+
+        # Average listeners for each day-hour across listening rows
+        listen_keys = listening['day'] * 24 + listening['hour']
+        hour_keys, inverse = np.unique(listen_keys, return_inverse=True)
+        average = (np.bincount(inverse, weights=listening['listener_hours']) /
+                   np.bincount(inverse, weights=listening['hours']))
+
+        spot_keys = spots['day'] * 24 + spots['hour']
+        position = np.clip(np.searchsorted(hour_keys, spot_keys), 0, len(hour_keys) - 1)
+        matched = hour_keys[position] == spot_keys
+        return np.where(matched, average[position], 0.0) * spots['aired']
+
+    def _order(self, dimension: str, names, metric, top: int) -> "np.ndarray":
+        """Row order for a table: latest weeks, dayparts in clock order, otherwise largest first"""
+        if dimension == 'week':
+            return np.arange(len(names))[-top:]
+        if dimension == 'daypart':
+            position = {name: i for i, (_, name) in enumerate(DAYPARTS + [(24, WEEKEND)])}
+            return np.argsort([position[name] for name in names.tolist()], kind='stable')
+        return np.argsort(-metric, kind='stable')[:top]
+
+    def _spot_rows(self, dimension: str, labels, impressions, top: int) -> List[Dict]:
+        spots = self.tables['spots']
+        names, inverse = np.unique(labels.astype(str), return_inverse=True)
+        scheduled = np.bincount(inverse, weights=spots['scheduled'])
+        aired = np.bincount(inverse, weights=spots['aired'])
+        reach = np.bincount(inverse, weights=impressions)
+
+        order = self._order(dimension, names, aired, top)
+        return [{
+            'name': str(names[i]),
+            'scheduled': int(scheduled[i]),
+            'aired': int(aired[i]),
+            'delivery_rate': round(float(aired[i] / scheduled[i]), 4) if scheduled[i] else 0.0,
+            'est_impressions': int(round(reach[i])),
+        } for i in order]
+
+    def _listening_rows(self, dimension: str, labels, top: int) -> List[Dict]:
+        listening = self.tables['listening']
+        names, inverse = np.unique(labels.astype(str), return_inverse=True)
+        listener_hours = np.bincount(inverse, weights=listening['listener_hours'])
+        hours = np.bincount(inverse, weights=listening['hours'])
+        average = listener_hours / hours
+
+        order = self._order(dimension, names, listener_hours, top)
+        return [{
+            'name': str(names[i]),
+            'hours': int(hours[i]),
+            'avg_listeners': round(float(average[i]), 1),
+            'listener_hours': int(round(listener_hours[i])),
+        } for i in order]
+
+
+def format_markdown(summary: Dict) -> str:
+    """Render the report as compact markdown tables for an agent session"""
+    lines = ["# Performance Analytics Summary"]
+    for kind, coverage in summary['coverage'].items():
+        lines.append(f"- {kind.title()} logs: {coverage['days']} days, {coverage['first_day']} to {coverage['last_day']}")
+
+    for dimension, rows in summary['spots'].items():
+        lines.append(f"\n## Spot Delivery by {dimension.title()}")
+        lines.append("| {} | Scheduled | Aired | Delivery | Est. Impressions |".format(dimension.title()))
+        lines.append("|---|---|---|---|---|")
+        for row in rows:
+            lines.append(f"| {row['name']} | {row['scheduled']:,} | {row['aired']:,} | "
+                         f"{row['delivery_rate']:.1%} | {row['est_impressions']:,} |")
+
+    for dimension, rows in summary['listening'].items():
+        lines.append(f"\n## Listening by {dimension.title()}")
+        lines.append("| {} | Hours | Avg Listeners | Listener Hours |".format(dimension.title()))
+        lines.append("|---|---|---|---|")
+        for row in rows:
+            lines.append(f"| {row['name']} | {row['hours']:,} | {row['avg_listeners']:,.1f} | {row['listener_hours']:,} |")
+
+    return '\n'.join(lines)
+
+
+def main():
+    """Main performance analysis function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Aggregate spot-delivery and listening logs for the performance analysis tasks')
+    parser.add_argument('--spots', nargs='*', default=[], help='Spot-delivery log files (CSV or Parquet)')
+    parser.add_argument('--listening', nargs='*', default=[], help='Hourly listening log files (CSV or Parquet)')
+    parser.add_argument('--cache', default='.analytics-cache',
+                       help='Directory for cached aggregates (default: .analytics-cache)')
+    parser.add_argument('--rebuild', action='store_true', help='Discard cached aggregates before ingesting')
+    parser.add_argument('--by', default='sponsor,daypart,program,week',
+                       help='Comma-separated dimensions: sponsor, daypart, program, week (default: all)')
+    parser.add_argument('--top', type=int, default=15, help='Rows per table (default: 15)')
+    parser.add_argument('--date-format', help='strptime format for log dates (default: ISO YYYY-MM-DD)')
+    for name in ('date', 'hour', 'sponsor', 'program', 'status', 'listeners'):
+        parser.add_argument(f'--{name}-column', default=name, help=f'{name.title()} column name (default: {name})')
+    parser.add_argument('--format', choices=['markdown', 'json'], default='markdown',
+                       help='Report format (default: markdown)')
+    parser.add_argument('--output', '-o', help='Write the report to a file instead of stdout')
+
+    args = parser.parse_args()
+
+    if np is None:
+        print("❌ NumPy is required: pip install numpy")
+        return 1
+
+    columns = {name: getattr(args, f'{name}_column') for name in ('date', 'hour', 'sponsor', 'program', 'status', 'listeners')}
+    analyzer = PerformanceAnalyzer(args.cache, columns=columns, date_format=args.date_format)
+
+    try:
+        if not args.rebuild:
+            analyzer.load_cache()
+
+        ingested = 0
+        for kind, paths in (('spots', args.spots), ('listening', args.listening)):
+            for path in paths:
+                if analyzer.ingest(kind, path):
+                    ingested += 1
+
+        if ingested or args.rebuild:
+            analyzer.save_cache()
+    except (OSError, ValueError) as e:
+        print(f"❌ Error analyzing logs: {e}")
+        return 1
+
+    if not analyzer.manifest:
+        print("❌ No logs ingested yet - pass --spots and/or --listening files")
+        return 1
+
+    summary = analyzer.report([d.strip() for d in args.by.split(',') if d.strip()], top=args.top)
+    summary['files_ingested'] = ingested
+    summary['rows_skipped'] = analyzer.rows_skipped
+
+    if args.format == 'json':
+        report = json.dumps(summary, indent=2)
+    else:
+        report = format_markdown(summary)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+        print(f"✅ Report written: {args.output} ({ingested} new log files, {analyzer.rows_skipped:,} rows skipped)")
+    else:
+        print(report)
+
+    return 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
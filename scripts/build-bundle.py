@@ -5,17 +5,31 @@ Automatically builds the complete publicradio.txt bundle from agent dependencies
 """
 
 import os
+import re
 import yaml
+import importlib.util
 from pathlib import Path
 from typing import Dict, List
 from datetime import datetime
 
+# Long section markers and the short tags used by --minify
+MARKER_PATTERN = re.compile(r'={20} (START|END): (\S+) ={20}')
+SECTION_PATTERN = re.compile(r'(={20} START: (\S+) ={20}\n)(.*?)(\n={20} END: \2 ={20})', re.DOTALL)
+
+# Decorative pictographic emoji (plus any trailing variation selector / space) stripped from minified markdown.
+# Symbols below U+1F300 such as ☐ ✓ ✗ ⚠ mark checkboxes and status, so they are kept.
+EMOJI_PATTERN = re.compile('[\U0001F300-\U0001FAFF][\uFE0F\u200D]* ?')
+
 class BundleBuilder:
     def __init__(self, base_path: str):
         self.base_path = Path(base_path)
         self.agents_path = self.base_path / "agents"
         self.dependencies_path = self.agents_path / "dependencies"
         self.output_file = self.base_path / "publicradio.txt"
+        self.fold_duplicates = False
+        self.duplicate_detector = None
+        self.minify = False
+        self.yaml_stats = {'compacted': 0, 'unchanged': 0, 'unparseable': 0}
         
     def build_bundle(self) -> bool:
         """Build the complete bundle from individual components"""
@@ -24,6 +38,10 @@ class BundleBuilder:
         try:
             bundle_content = []
             
+            if self.fold_duplicates:
+                self.duplicate_detector = self._load_duplicate_detector()
+                self.duplicate_detector.analyze()
+            
             # Add header
             bundle_content.append(self._generate_header())
             
@@ -46,8 +64,20 @@ class BundleBuilder:
             # Add shared resources
             bundle_content.append(self._add_shared_resources())
             
+            # Add content folded out of near-duplicate blocks
+            if self.duplicate_detector:
+                shared_section = self.duplicate_detector.shared_section()
+                if shared_section:
+                    bundle_content.append(shared_section)
+                print(f"🧩 Folded {len(self.duplicate_detector.folded_clusters)} duplicate block groups "
+                      f"({self.duplicate_detector.folded_block_count()} copies) into a shared section")
+            
             # Write bundle to file
             final_content = '\n\n'.join(bundle_content)
+            original_size = len(final_content)
+            
+            if self.minify:
+                final_content = self._minify_bundle(final_content)
             
             with open(self.output_file, 'w', encoding='utf-8') as f:
                 f.write(final_content)
@@ -55,6 +85,13 @@ class BundleBuilder:
             print(f"✅ Bundle successfully built: {self.output_file}")
             print(f"📏 Bundle size: {len(final_content):,} characters")
             
+            if self.minify:
+                reduction = 1 - len(final_content) / original_size
+                print(f"🗜️  Minified from {original_size:,} characters ({reduction:.1%} smaller)")
+                print(f"🧾 YAML sections: {self.yaml_stats['compacted']} compacted and verified, "
+                      f"{self.yaml_stats['unchanged']} kept as written, "
+                      f"{self.yaml_stats['unparseable']} left untouched (invalid YAML)")
+            
             return True
             
         except Exception as e:
@@ -150,6 +187,16 @@ workflows:
             if start_idx != -1 and end_idx != -1:
                 return content[start_idx:end_idx + len(end_marker)]
                 
+            # Previous bundle was minified - restore the long markers
+            short_start = "<<START: .bmad-core/agents/bmad-orchestrator.md>>"
+            short_end = "<<END: .bmad-core/agents/bmad-orchestrator.md>>"
+            
+            start_idx = content.find(short_start)
+            end_idx = content.find(short_end)
+            
+            if start_idx != -1 and end_idx != -1:
+                return start_marker + content[start_idx + len(short_start):end_idx] + end_marker
+                
         except FileNotFoundError:
             pass
             
@@ -268,6 +315,9 @@ commands:
                         with open(dep_file, 'r', encoding='utf-8') as f:
                             content = f.read().strip()
                             
+                        if self.duplicate_detector:
+                            content = self.duplicate_detector.fold_content(dep_file, content)
+                            
                         sections.append(f"==================== START: .bmad-core/{dep_type}/{dep_name}{extension} ====================")
                         sections.append(content)
                         sections.append(f"==================== END: .bmad-core/{dep_type}/{dep_name}{extension} ====================")
@@ -277,6 +327,151 @@ commands:
                         
         return '\n\n'.join(sections) if sections else ""
         
+    def _load_duplicate_detector(self):
+        """Load the near-duplicate detector from the sibling find-near-duplicates.py script"""
+        script_path = Path(__file__).resolve().parent / "find-near-duplicates.py"
+        spec = importlib.util.spec_from_file_location("find_near_duplicates", script_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        
+        # Only identical blocks are folded, so only exact matches need to be found
+        return module.NearDuplicateDetector(str(self.base_path), threshold=1.0)
+        
+    def _minify_bundle(self, content: str) -> str:
+        """Minify every bundle section and collapse the section markers into short tags"""
+        self.yaml_stats = {'compacted': 0, 'unchanged': 0, 'unparseable': 0}
+        
+        def minify_section(match):
+            path, body = match.group(2), match.group(3)
+            if path.endswith('.yaml'):
+                body = self._minify_yaml(body)
+            else:
+                body = self._minify_markdown(body)
+            return match.group(1) + body + match.group(4)
+            
+        pieces = []
+        last = 0
+        for match in SECTION_PATTERN.finditer(content):
+            pieces.append(self._minify_markdown(content[last:match.start()]))
+            pieces.append(minify_section(match))
+            last = match.end()
+        pieces.append(self._minify_markdown(content[last:]))
+        
+        content = '\n'.join(piece for piece in pieces if piece.strip())
+        return MARKER_PATTERN.sub(r'<<\1: \2>>', content)
+        
+    def _minify_markdown(self, text: str) -> str:
+        """Drop blank lines, trailing whitespace, bold markers and decorative emoji outside code fences"""
+        lines = []
+        in_fence = False
+        
+        for line in text.split('\n'):
+            if line.lstrip().startswith('```'):
+                in_fence = not in_fence
+                lines.append(line.rstrip())
+                continue
+                
+            if in_fence:
+                lines.append(line)
+                continue
+                
+            line = EMOJI_PATTERN.sub('', line).replace('**', '').rstrip()
+            if line.strip():
+                lines.append(line)
+                
+        return '\n'.join(lines).strip('\n')
+        
+    def _minify_yaml(self, text: str) -> str:
+        """Rewrite comment-free top-level keys in flow style, keeping the original if the tree changes"""
+        try:
+            original_tree = yaml.safe_load(text)
+        except yaml.YAMLError:
+            self.yaml_stats['unparseable'] += 1
+            return text
+            
+        if not isinstance(original_tree, dict):
+            self.yaml_stats['unchanged'] += 1
+            return text
+            
+        lines = [line.rstrip() for line in text.split('\n')]
+        result = '\n'.join(self._compact_yaml_lines(lines, 0))
+        
+        # Round-trip check: the minified section must parse to the same tree
+        try:
+            if yaml.safe_load(result) == original_tree:
+                self.yaml_stats['compacted'] += 1
+                return result
+        except yaml.YAMLError:
+            pass
+            
+        self.yaml_stats['unchanged'] += 1
+        return text
+        
+    def _compact_yaml_lines(self, lines: List[str], indent: int) -> List[str]:
+        """Group lines into entries at one indentation level and compact each entry"""
+        entries = []
+        for line in lines:
+            if not line.strip():
+                continue
+            if not entries or len(line) - len(line.lstrip()) <= indent:
+                entries.append([line])
+            else:
+                entries[-1].append(line)
+                
+        compacted = []
+        for entry in entries:
+            compacted.extend(self._compact_yaml_entry(entry, indent))
+        return compacted
+        
+    def _compact_yaml_entry(self, entry: List[str], indent: int) -> List[str]:
+        """Rewrite a comment-free entry in flow style, or descend into its children"""
+        # Comments hold allowed values and guidance, so commented lines stay as written
+        has_comment = [bool(re.search(r'(^|\s)#', line)) for line in entry]
+        
+        if not any(has_comment):
+            flowed = self._flow_entry('\n'.join(line[indent:] for line in entry))
+            if flowed:
+                return [' ' * indent + line for line in flowed.split('\n')]
+            return entry
+            
+        head = entry[0]
+        if len(entry) > 1 and not has_comment[0] and head.rstrip().endswith(':') and not head.lstrip().startswith('-'):
+            child_indent = len(entry[1]) - len(entry[1].lstrip())
+            return [head] + self._compact_yaml_lines(entry[1:], child_indent)
+            
+        return entry
+        
+    def _flow_entry(self, entry_text: str) -> str:
+        """Serialize a single key or list item with its nested collections in flow style"""
+        try:
+            node = yaml.compose(entry_text)
+        except yaml.YAMLError:
+            return ""
+            
+        if isinstance(node, yaml.MappingNode) and len(node.value) == 1:
+            value_node = node.value[0][1]
+        elif isinstance(node, yaml.SequenceNode) and len(node.value) == 1:
+            value_node = node.value[0]
+        else:
+            return ""
+            
+        if not isinstance(value_node, (yaml.MappingNode, yaml.SequenceNode)):
+            return ""
+            
+        stack = [value_node]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, yaml.MappingNode):
+                current.flow_style = True
+                for pair in current.value:
+                    stack.extend(pair)
+            elif isinstance(current, yaml.SequenceNode):
+                current.flow_style = True
+                stack.extend(current.value)
+                
+        node.flow_style = False
+        return yaml.serialize(node, width=float('inf'), allow_unicode=True).strip()
+        
     def _add_workflows(self) -> str:
         """Add workflow configurations"""
         workflows = [
@@ -441,6 +636,10 @@ def main():
                        help='Path to the public-radio-agents directory (default: current directory)')
     parser.add_argument('--output', '-o', 
                        help='Output file path (default: publicradio.txt)')
+    parser.add_argument('--fold-duplicates', action='store_true',
+                       help='Fold identical markdown blocks into a shared bundle section')
+    parser.add_argument('--minify', action='store_true',
+                       help='Minify the bundle to reduce tokens (short section tags, compact YAML)')
     
     args = parser.parse_args()
     
@@ -452,6 +651,9 @@ def main():
     if args.output:
         builder.output_file = Path(args.output)
     
+    builder.fold_duplicates = args.fold_duplicates
+    builder.minify = args.minify
+    
     success = builder.build_bundle()
     
     if success:
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Public Radio Agents Framework Near-Duplicate Detector
+Finds near-duplicate paragraphs across agent dependency files using MinHash shingling
+"""
+
+import re
+import random
+import zlib
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SHARED_SECTION_PATH = ".bmad-core/data/shared-content.md"
+
+# Mersenne prime used for the MinHash permutations
+_PRIME = (1 << 61) - 1
+
+
+class ContentBlock:
+    def __init__(self, file_path: Path, index: int, line: int, text: str):
+        self.file_path = file_path
+        self.index = index
+        self.line = line
+        self.text = text
+        self.shingles = set()
+        self.signature = ()
+
+    def snippet(self, width: int = 70) -> str:
+        """Single-line preview of the block for reports"""
+        flat = ' '.join(self.text.split())
+        return flat if len(flat) <= width else flat[:width - 3] + '...'
+
+
+class NearDuplicateDetector:
+    def __init__(self, base_path: str, threshold: float = 0.8, shingle_size: int = 5,
+                 num_perm: int = 128, bands: int = 32, min_words: int = 12):
+        self.base_path = Path(base_path)
+        self.agents_path = self.base_path / "agents"
+        self.dependencies_path = self.agents_path / "dependencies"
+
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_words = min_words
+
+        rng = random.Random(1)
+        self._permutations = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+                              for _ in range(num_perm)]
+
+        self.blocks: List[ContentBlock] = []
+        self.pairs: List[Tuple[float, ContentBlock, ContentBlock]] = []
+        self.clusters: List[List[ContentBlock]] = []
+        self.folded_clusters: List[List[ContentBlock]] = []
+        self._replacements: Dict[Path, Dict[int, str]] = {}
+
+    def analyze(self) -> List[List[ContentBlock]]:
+        """Collect blocks from every dependency file and group near-duplicates"""
+        self.blocks = self._collect_blocks()
+
+        for block in self.blocks:
+            block.shingles = self._shingle(block.text)
+            block.signature = self._minhash(block.shingles)
+
+        self.pairs = self._find_pairs()
+        self.clusters = self._cluster_pairs()
+        self.folded_clusters = self._select_folds()
+        self._replacements = self.fold_map()
+        return self.clusters
+
+    def _collect_blocks(self) -> List[ContentBlock]:
+        """Split every dependency file into paragraph blocks"""
+        blocks = []
+
+        dep_types = {
+            'data': '.md',
+            'tasks': '.md',
+            'templates': '.yaml',
+            'checklists': '.md'
+        }
+
+        if not self.dependencies_path.exists():
+            return blocks
+
+        for agent_dir in sorted(self.dependencies_path.iterdir()):
+            if not agent_dir.is_dir():
+                continue
+
+            for dep_type, extension in dep_types.items():
+                dep_dir = agent_dir / dep_type
+                if not dep_dir.is_dir():
+                    continue
+
+                for dep_file in sorted(f for f in dep_dir.iterdir() if f.is_file() and f.suffix == extension):
+                    try:
+                        with open(dep_file, 'r', encoding='utf-8') as f:
+                            content = f.read().strip()
+                    except Exception as e:
+                        print(f"❌ Error reading dependency {dep_file}: {e}")
+                        continue
+
+                    blocks.extend(self._split_blocks(dep_file, content))
+
+        return blocks
+
+    def _split_blocks(self, file_path: Path, content: str) -> List[ContentBlock]:
+        """Split content on blank lines, keeping blocks long enough to compare"""
+        blocks = []
+        line = 1
+
+        for index, part in enumerate(re.split(r'(\n\s*\n)', content)):
+            if index % 2 == 0 and len(part.split()) >= self.min_words:
+                blocks.append(ContentBlock(file_path, index, line, part))
+            line += part.count('\n')
+
+        return blocks
+
+    def _shingle(self, text: str) -> set:
+        """Hash overlapping word n-grams of the normalized text"""
+        words = re.findall(r"[a-z0-9']+", text.lower())
+        if len(words) < self.shingle_size:
+            return {zlib.crc32(' '.join(words).encode('utf-8'))}
+
+        return {
+            zlib.crc32(' '.join(words[i:i + self.shingle_size]).encode('utf-8'))
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    def _minhash(self, shingles: set) -> tuple:
+        """Compute the MinHash signature of a shingle set"""
+        return tuple(min((a * s + b) % _PRIME for s in shingles) for a, b in self._permutations)
+
+    def _find_pairs(self) -> List[Tuple[float, ContentBlock, ContentBlock]]:
+        """Use LSH banding to find candidates, then confirm with exact Jaccard similarity"""
+        candidates = set()
+
+        for band in range(self.bands):
+            buckets: Dict[tuple, List[int]] = {}
+            start = band * self.rows
+            for i, block in enumerate(self.blocks):
+                key = block.signature[start:start + self.rows]
+                buckets.setdefault(key, []).append(i)
+
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                for x in range(len(members)):
+                    for y in range(x + 1, len(members)):
+                        candidates.add((members[x], members[y]))
+
+        pairs = []
+        for i, j in candidates:
+            first, second = self.blocks[i], self.blocks[j]
+            if first.file_path == second.file_path:
+                continue
+
+            similarity = self._jaccard(first.shingles, second.shingles)
+            if similarity >= self.threshold:
+                pairs.append((similarity, first, second))
+
+        pairs.sort(key=lambda p: (-p[0], str(p[1].file_path), p[1].line))
+        return pairs
+
+    def _jaccard(self, first: set, second: set) -> float:
+        """Exact Jaccard similarity of two shingle sets"""
+        if not first or not second:
+            return 0.0
+        return len(first & second) / len(first | second)
+
+    def _cluster_pairs(self) -> List[List[ContentBlock]]:
+        """Group matched blocks into clusters with union-find"""
+        parent = {}
+
+        def find(block):
+            parent.setdefault(id(block), block)
+            root = block
+            while parent[id(root)] is not root:
+                root = parent[id(root)]
+            parent[id(block)] = root
+            return root
+
+        for _, first, second in self.pairs:
+            root_first, root_second = find(first), find(second)
+            if root_first is not root_second:
+                parent[id(root_second)] = root_first
+
+        groups: Dict[int, List[ContentBlock]] = {}
+        for block in self.blocks:
+            if id(block) in parent:
+                groups.setdefault(id(find(block)), []).append(block)
+
+        clusters = [sorted(group, key=lambda b: (str(b.file_path), b.line)) for group in groups.values()]
+        clusters.sort(key=lambda c: -self._cluster_savings(c))
+        return clusters
+
+    def _cluster_savings(self, cluster: List[ContentBlock]) -> int:
+        """Characters saved by keeping a single copy of the cluster"""
+        canonical = self._canonical(cluster)
+        return sum(len(b.text) for b in cluster if b is not canonical)
+
+    def _canonical(self, cluster: List[ContentBlock]) -> ContentBlock:
+        """Longest block in the cluster is kept as the shared copy"""
+        return max(cluster, key=lambda b: len(b.text))
+
+    def _is_foldable(self, block: ContentBlock) -> bool:
+        """Only fold markdown prose; templates must stay valid YAML"""
+        return block.file_path.suffix == '.md' and '```' not in block.text
+
+    def _foldable_clusters(self) -> List[List[ContentBlock]]:
+        """Groups of identical foldable blocks where folding actually saves characters
+
+        Near-duplicates are only reported; folding them would replace each copy's
+        own wording, so a group must match exactly after whitespace normalization.
+        """
+        groups = []
+        for cluster in self.clusters:
+            identical: Dict[str, List[ContentBlock]] = {}
+            for block in cluster:
+                if self._is_foldable(block):
+                    identical.setdefault(' '.join(block.text.split()), []).append(block)
+            groups.extend(group for group in identical.values() if len(group) > 1)
+
+        clusters = []
+        for foldable in groups:
+            # Every copy becomes a reference and one copy moves to the shared section
+            reference_cost = len(foldable) * len(f"[Shared block S{len(clusters) + 1}: see `{SHARED_SECTION_PATH}`]")
+            heading_cost = len(f"## S{len(clusters) + 1}\n\n\n\n")
+            saved = sum(len(b.text) for b in foldable) - len(self._canonical(foldable).text)
+            if saved > reference_cost + heading_cost:
+                clusters.append(foldable)
+        return clusters
+
+    def _select_folds(self) -> List[List[ContentBlock]]:
+        """Fold only when the savings outweigh the shared section's own markers and header"""
+        clusters = self._foldable_clusters()
+        if not clusters:
+            return []
+
+        saved = sum(sum(len(b.text) for b in c) - len(self._canonical(c).text) for c in clusters)
+        if saved <= len(self._render_shared_section([])):
+            return []
+        return clusters
+
+    def folded_block_count(self) -> int:
+        """Number of block copies replaced by shared references"""
+        return sum(len(cluster) for cluster in self.folded_clusters)
+
+    def fold_map(self) -> Dict[Path, Dict[int, str]]:
+        """Map each file to the blocks that should be replaced by shared references"""
+        replacements: Dict[Path, Dict[int, str]] = {}
+
+        for number, cluster in enumerate(self.folded_clusters, 1):
+            reference = f"[Shared block S{number}: see `{SHARED_SECTION_PATH}`]"
+            for block in cluster:
+                replacements.setdefault(block.file_path, {})[block.index] = reference
+
+        return replacements
+
+    def fold_content(self, file_path: Path, content: str) -> str:
+        """Replace folded blocks in a dependency file's content with shared references"""
+        replacements = self._replacements.get(Path(file_path))
+        if not replacements:
+            return content
+
+        parts = re.split(r'(\n\s*\n)', content)
+        for index, reference in replacements.items():
+            if index < len(parts):
+                parts[index] = reference
+        return ''.join(parts)
+
+    def shared_section(self) -> str:
+        """Build the shared bundle section holding one copy of each folded block"""
+        if not self.folded_clusters:
+            return ""
+        return self._render_shared_section(self.folded_clusters)
+
+    def _render_shared_section(self, clusters: List[List[ContentBlock]]) -> str:
+        """Render the shared section with START/END markers"""
+        sections = [f"==================== START: {SHARED_SECTION_PATH} ===================="]
+        sections.append("# Shared Content\n\nBlocks repeated across agent resources are stored once here and referenced by ID.")
+
+        for number, cluster in enumerate(clusters, 1):
+            sections.append(f"## S{number}\n\n{self._canonical(cluster).text}")
+
+        sections.append(f"==================== END: {SHARED_SECTION_PATH} ====================")
+        return '\n\n'.join(sections)
+
+    def print_report(self, limit: int = 50):
+        """Print near-duplicate clusters with similarity scores"""
+        print("\n" + "="*60)
+
+        if not self.clusters:
+            print(f"✅ No near-duplicate blocks found at similarity >= {self.threshold:.2f}")
+            print("\n" + "="*60)
+            return
+
+        pair_scores = {}
+        for similarity, first, second in self.pairs:
+            pair_scores[id(first)] = max(pair_scores.get(id(first), 0.0), similarity)
+            pair_scores[id(second)] = max(pair_scores.get(id(second), 0.0), similarity)
+
+        print(f"🔁 NEAR-DUPLICATE CLUSTERS ({len(self.clusters)}):")
+        for number, cluster in enumerate(self.clusters[:limit], 1):
+            canonical = self._canonical(cluster)
+            print(f"\n  [{number}] {len(cluster)} blocks, ~{self._cluster_savings(cluster) // 4:,} tokens redundant")
+            print(f"      \"{canonical.snippet()}\"")
+            for block in cluster:
+                relative = block.file_path.relative_to(self.dependencies_path)
+                print(f"      • {pair_scores.get(id(block), 0.0):.2f}  {relative}:{block.line}")
+
+        if len(self.clusters) > limit:
+            print(f"\n  ... {len(self.clusters) - limit} more clusters not shown (use --limit)")
+
+        total_chars = sum(len(b.text) for b in self.blocks)
+        redundant_chars = sum(self._cluster_savings(c) for c in self.clusters)
+
+        print("\n" + "="*60)
+        print(f"📊 Blocks compared: {len(self.blocks):,}")
+        print(f"📊 Matching pairs: {len(self.pairs):,}")
+        if total_chars:
+            print(f"📏 Redundant content: {redundant_chars:,} characters "
+                  f"(~{redundant_chars // 4:,} tokens, {redundant_chars / total_chars:.1%} of compared text)")
+
+
+def main():
+    """Main near-duplicate detection function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Find near-duplicate content across Public Radio Agents dependencies')
+    parser.add_argument('path', nargs='?', default='.',
+                       help='Path to the public-radio-agents directory (default: current directory)')
+    parser.add_argument('--threshold', '-t', type=float, default=0.8,
+                       help='Minimum Jaccard similarity to report (default: 0.8)')
+    parser.add_argument('--shingle-size', type=int, default=5,
+                       help='Words per shingle (default: 5)')
+    parser.add_argument('--min-words', type=int, default=12,
+                       help='Ignore blocks shorter than this many words (default: 12)')
+    parser.add_argument('--limit', type=int, default=50,
+                       help='Maximum number of clusters to print (default: 50)')
+
+    args = parser.parse_args()
+
+    print("Public Radio Agents Framework - Near-Duplicate Detector")
+    print("=" * 60)
+    print("🔍 Comparing paragraph blocks across dependency files...")
+
+    detector = NearDuplicateDetector(args.path, threshold=args.threshold,
+                                     shingle_size=args.shingle_size, min_words=args.min_words)
+    detector.analyze()
+    detector.print_report(limit=args.limit)
+
+    if detector.clusters:
+        print(f"🧩 Foldable groups (identical markdown blocks): {len(detector.folded_clusters)}")
+        if detector.folded_clusters:
+            print("\n📋 To fold these blocks into a shared bundle section:")
+            print("  python scripts/build-bundle.py --fold-duplicates")
+
+    return 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
@@ -52,8 +52,8 @@ class DependencyValidator:
             with open(self.publicradio_txt, 'r', encoding='utf-8') as f:
                 content = f.read()
                 
-            # Find agent YAML sections
-            agent_pattern = r'==================== START: \.bmad-core/agents/([^=]+)\.md ====================\n(.*?)\n==================== END: \.bmad-core/agents/[^=]+\.md ===================='
+            # Find agent YAML sections (long markers, or short tags from a --minify build)
+            agent_pattern = r'(?:==================== START: |<<START: )\.bmad-core/agents/([^=<>]+)\.md(?: ====================|>>)\n(.*?)\n(?:==================== END: |<<END: )\.bmad-core/agents/[^=<>]+\.md(?: ====================|>>)'
             
             for match in re.finditer(agent_pattern, content, re.DOTALL):
                 agent_id = match.group(1)
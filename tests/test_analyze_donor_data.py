@@ -0,0 +1,112 @@
+"""Tests for the streaming donor analysis in scripts/analyze-donor-data.py"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+spec = importlib.util.spec_from_file_location("analyze_donor_data", SCRIPTS / "analyze-donor-data.py")
+analyze_donor_data = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(analyze_donor_data)
+
+
+def write_gifts(path, rows):
+    lines = ["donor_id,gift_date,amount"] + [f"{donor},{day},{amount}" for donor, day, amount in rows]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+def test_last_gift_on_december_30_is_a_complete_year(tmp_path):
+    export = write_gifts(tmp_path / "gifts.csv", [
+        ('A', '2022-03-01', 50), ('B', '2022-06-01', 100),
+        ('A', '2023-04-01', 75), ('C', '2023-08-01', 20), ('B', '2023-12-30', 120),
+    ])
+
+    summary = analyze_donor_data.DonorDataAnalyzer(export).analyze()
+
+    assert summary['partial_year'] is None
+    assert [row['year'] for row in summary['retention']] == [2023]
+    assert summary['upgrades']['compared_years'] == [2022, 2023]
+
+
+# Three complete years; first gifts: A, B, C in 2021, D in 2022, E in 2023
+GIFTS = [
+    ('A', '2021-02-01', 100), ('B', '2021-05-01', 50), ('C', '2021-07-01', 20),
+    ('A', '2022-02-01', 150), ('D', '2022-03-01', 10), ('B', '2022-06-01', 50),
+    ('A', '2023-02-01', 100), ('D', '2023-04-01', 30), ('C', '2023-09-01', 40), ('E', '2023-12-31', 25),
+]
+
+
+def test_retention_and_first_year_retention(tmp_path):
+    summary = analyze_donor_data.DonorDataAnalyzer(write_gifts(tmp_path / "gifts.csv", GIFTS)).analyze()
+
+    assert summary['retention'] == [
+        {'year': 2022, 'prior_year_donors': 3, 'retained': 2, 'retention_rate': 0.6667,
+         'first_year_retention_rate': 0.6667, 'reactivated': 0},
+        {'year': 2023, 'prior_year_donors': 3, 'retained': 2, 'retention_rate': 0.6667,
+         'first_year_retention_rate': 1.0, 'reactivated': 1},
+    ]
+    assert summary['cohorts'] == [
+        {'cohort': 2021, 'donors': 3, 'retention_by_year': [0.6667, 0.6667]},
+        {'cohort': 2022, 'donors': 1, 'retention_by_year': [1.0]},
+        {'cohort': 2023, 'donors': 1, 'retention_by_year': []},
+    ]
+
+
+def test_upgrades_compare_the_last_two_years(tmp_path):
+    summary = analyze_donor_data.DonorDataAnalyzer(write_gifts(tmp_path / "gifts.csv", GIFTS)).analyze()
+
+    assert summary['upgrades'] == {
+        'compared_years': [2022, 2023], 'donors_in_both_years': 2, 'upgraded': 1, 'downgraded': 1,
+        'unchanged': 0, 'upgrade_revenue': 20.0, 'downgrade_revenue': 50.0,
+    }
+
+
+def test_rfm_quintiles_share_the_lower_score_on_ties():
+    analyzer = analyze_donor_data.DonorDataAnalyzer("unused.csv")
+
+    assert analyzer._quintile(np.array([50, 10, 40, 20, 30])).tolist() == [5, 1, 4, 2, 3]
+    assert analyzer._quintile(np.array([7, 7, 7, 7, 7])).tolist() == [1, 1, 1, 1, 1]
+    assert analyzer._quintile(np.array([1, 2, 2, 2, 3])).tolist() == [1, 2, 2, 2, 5]
+
+
+def test_summary_does_not_depend_on_chunk_size(tmp_path):
+    export = write_gifts(tmp_path / "gifts.csv", GIFTS)
+
+    one_row = analyze_donor_data.DonorDataAnalyzer(export, chunk_size=1).analyze()
+    one_chunk = analyze_donor_data.DonorDataAnalyzer(export, chunk_size=100000).analyze()
+
+    assert one_row == one_chunk
+
+
+def test_unreadable_rows_are_counted_as_skipped(tmp_path):
+    rows = GIFTS + [('', '2023-05-01', 10), ('F', 'not a date', 10), ('G', '2023-05-01', 'n/a')]
+    summary = analyze_donor_data.DonorDataAnalyzer(write_gifts(tmp_path / "gifts.csv", rows)).analyze()
+
+    assert summary['rows_processed'] == 13
+    assert summary['rows_skipped'] == 3
+    assert summary['donors'] == 5
+    assert summary['gifts'] == 10
+
+
+def test_partial_final_year_is_excluded(tmp_path):
+    rows = GIFTS + [('A', '2024-03-15', 500)]
+    summary = analyze_donor_data.DonorDataAnalyzer(write_gifts(tmp_path / "gifts.csv", rows)).analyze()
+
+    assert summary['partial_year'] == 2024
+    assert [row['year'] for row in summary['retention']] == [2022, 2023]
+    assert [row['cohort'] for row in summary['cohorts']] == [2021, 2022, 2023]
+    assert summary['upgrades']['compared_years'] == [2022, 2023]
+
+
+def test_period_end_decides_whether_the_final_year_is_complete(tmp_path):
+    export = write_gifts(tmp_path / "gifts.csv", GIFTS[:-1] + [('E', '2023-12-26', 25)])
+
+    assert analyze_donor_data.DonorDataAnalyzer(export).analyze()['partial_year'] is None
+    assert analyze_donor_data.DonorDataAnalyzer(export, period_end='2023-12-26').analyze()['partial_year'] == 2023
+    assert analyze_donor_data.DonorDataAnalyzer(export, period_end='2023-12-31').analyze()['partial_year'] is None
@@ -0,0 +1,98 @@
+"""Tests for the cached spot and listening log aggregation in scripts/analyze-performance.py"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+spec = importlib.util.spec_from_file_location("analyze_performance", SCRIPTS / "analyze-performance.py")
+analyze_performance = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(analyze_performance)
+
+
+def write_spots(path, rows):
+    lines = ["date,hour,sponsor,program,status"]
+    lines += [f"{day},{hour},{sponsor},Morning Edition,aired" for day, hour, sponsor in rows]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+def scheduled_by_sponsor(analyzer):
+    return {row['name']: row['scheduled'] for row in analyzer.report(['sponsor'])['spots']['sponsor']}
+
+
+def test_overlapping_files_are_added_together(tmp_path):
+    rows = [('2025-03-03', 6, 'Acme'), ('2025-03-04', 7, 'Acme'), ('2025-03-04', 8, 'Beta')]
+    spots_a = write_spots(tmp_path / "spots_a.csv", rows)
+    spots_b = write_spots(tmp_path / "spots_b.csv", rows)
+
+    analyzer = analyze_performance.PerformanceAnalyzer(tmp_path / "cache")
+    analyzer.ingest('spots', spots_a)
+    analyzer.ingest('spots', spots_b)
+
+    assert scheduled_by_sponsor(analyzer) == {'Acme': 4, 'Beta': 2}
+
+
+def test_changed_file_replaces_only_its_own_rows(tmp_path):
+    spots_a = write_spots(tmp_path / "spots_a.csv", [('2025-03-03', 6, 'Acme'), ('2025-03-04', 7, 'Acme')])
+    spots_b = write_spots(tmp_path / "spots_b.csv", [('2025-03-04', 8, 'Beta')])
+
+    analyzer = analyze_performance.PerformanceAnalyzer(tmp_path / "cache")
+    analyzer.ingest('spots', spots_a)
+    analyzer.ingest('spots', spots_b)
+    analyzer.save_cache()
+
+    # Re-export spots_a without 2025-03-03; the stale day must disappear
+    write_spots(spots_a, [('2025-03-04', 7, 'Acme'), ('2025-03-05', 9, 'Gamma')])
+    reloaded = analyze_performance.PerformanceAnalyzer(tmp_path / "cache")
+    reloaded.load_cache()
+    assert reloaded.ingest('spots', spots_a)
+
+    assert scheduled_by_sponsor(reloaded) == {'Acme': 1, 'Beta': 1, 'Gamma': 1}
+    assert reloaded.report([])['coverage']['spots']['first_day'] == '2025-03-04'
+
+
+def test_unchanged_file_is_not_reingested(tmp_path):
+    spots_a = write_spots(tmp_path / "spots_a.csv", [('2025-03-03', 6, 'Acme')])
+
+    analyzer = analyze_performance.PerformanceAnalyzer(tmp_path / "cache")
+    assert analyzer.ingest('spots', spots_a)
+    assert not analyzer.ingest('spots', spots_a)
+    assert scheduled_by_sponsor(analyzer) == {'Acme': 1}
+
+
+def test_hours_accept_decimal_and_hhmm_values(tmp_path):
+    decimal = tmp_path / "decimal.csv"
+    decimal.write_text("date,hour,sponsor,program\n"
+                       "2025-03-03,6.0,Acme,Morning Edition\n"
+                       "2025-03-03,6:45 AM,Acme,Morning Edition\n"
+                       "2025-03-03,2025-03-03T18:00:00,Acme,All Things Considered\n", encoding='utf-8')
+    # HHMM times from Parquet or Excel integers lose their leading zero
+    hhmm = tmp_path / "hhmm.csv"
+    hhmm.write_text("date,hour,sponsor,program\n"
+                    "2025-03-04,600,Acme,Morning Edition\n"
+                    "2025-03-04,930,Acme,Morning Edition\n"
+                    "2025-03-04,15,Acme,Overnight\n"
+                    "2025-03-04,1430,Acme,Here and Now\n", encoding='utf-8')
+
+    analyzer = analyze_performance.PerformanceAnalyzer(tmp_path / "cache")
+    analyzer.ingest('spots', decimal)
+    analyzer.ingest('spots', hhmm)
+
+    assert analyzer.rows_skipped == 0
+    spots = analyzer.tables['spots']
+    assert sorted(spots['hour'][spots['day'] == spots['day'].min()].tolist()) == [6, 18]
+    assert sorted(spots['hour'][spots['day'] == spots['day'].max()].tolist()) == [0, 6, 9, 14]
+
+
+def test_file_with_every_row_skipped_is_an_error(tmp_path):
+    spots = write_spots(tmp_path / "spots.csv", [('03/03/2025', 6, 'Acme'), ('03/04/2025', 7, 'Acme')])
+
+    analyzer = analyze_performance.PerformanceAnalyzer(tmp_path / "cache")
+    with pytest.raises(ValueError, match="All 2 rows of spots.csv were skipped"):
+        analyzer.ingest('spots', spots)